@@ -1,18 +1,665 @@
 import argparse
+import ast
+import builtins
 import json
 import logging
+import mmap
+import operator
+import os
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from faker import Faker
 
+try:
+    import ijson  # Optional: enables constant-memory streaming of large inputs
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Optional: C-optimized JSON parsing and serialization
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np  # Optional: vectorizes simple condition comparisons
+except ImportError:
+    np = None
+
+try:
+    from numba import njit, prange  # Optional: JIT-compiles numeric predicates
+except ImportError:
+    njit = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Shared globals for condition evaluation.  Built once so every eval() call
+# reuses the same dict instead of allocating a fresh one per record.  Real
+# builtins are exposed, matching the baseline eval(cond, {}, record) call
+# where conditions could use len(), str(), etc.
+_GLOBALS = {'__builtins__': builtins}
+
+# Sentinel marking keys absent from a record in the columnar view, so that
+# missing keys stay distinguishable from explicit nulls.
+_MISSING = object()
+
+# Comparison operators that translate to NumPy array operations.
+_VEC_OPS = {
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+# Operator ids for the Numba kernel, which can't take Python callables.
+_NUMBA_OP_IDS = {
+    operator.gt: 0,
+    operator.ge: 1,
+    operator.lt: 2,
+    operator.le: 3,
+    operator.eq: 4,
+    operator.ne: 5,
+}
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _numba_cmp_mask(arr, literal, op_id):
+        out = np.empty(arr.size, np.bool_)
+        for i in prange(arr.size):
+            v = arr[i]
+            if op_id == 0:
+                out[i] = v > literal
+            elif op_id == 1:
+                out[i] = v >= literal
+            elif op_id == 2:
+                out[i] = v < literal
+            elif op_id == 3:
+                out[i] = v <= literal
+            elif op_id == 4:
+                out[i] = v == literal
+            else:
+                out[i] = v != literal
+        return out
+else:
+    _numba_cmp_mask = None
+
+_numba_warmed = False
+
+
+def _warm_numba():
+    """
+    Triggers the one-time JIT compile of the comparison kernel.
+
+    Called before the first masking pass so the compile cost (tens to
+    hundreds of ms on a cold cache) doesn't land inside the hot loop.
+    """
+    global _numba_warmed
+    if _numba_cmp_mask is None or _numba_warmed:
+        return
+    # Both dtypes the dispatcher can receive: int64 columns compare
+    # exactly, float64 covers everything else numeric.
+    _numba_cmp_mask(np.zeros(1, dtype=np.float64), 0.0, 0)
+    _numba_cmp_mask(np.zeros(1, dtype=np.int64), 0, 0)
+    _numba_warmed = True
+
+# Number of records masked per batch when streaming the input with ijson.
+# Large enough to amortize the per-rule passes, small enough to keep the
+# working set bounded regardless of input size.
+_CHUNK_SIZE = 4096
+
+# Buffer size for reading input files.  MB-sized reads amortize the
+# per-call I/O bookkeeping that the default (8 KiB) buffering incurs.
+_READ_BUFFER_SIZE = 1 << 20
+
+# Inputs at least this large are memory-mapped instead of read into a
+# bytes copy; below it the mmap setup costs more than it saves.
+_MMAP_MIN_BYTES = 8 << 20
+
+# Below this many records the cost of spawning worker processes outweighs
+# the parallel speedup, so masking stays serial.
+_PARALLEL_MIN_RECORDS = 8192
+
+# Number of leading records sampled to infer the dataset's key universe
+# when pruning rules that cannot apply.
+_SCHEMA_SAMPLE = 32
+
+
+def _load_json(buf):
+    """
+    Parses a JSON document from a str or bytes buffer.
+
+    Uses orjson when available; its JSONDecodeError subclasses the stdlib
+    one, so callers only need to catch json.JSONDecodeError.
+    """
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(buf)
+
+
+def _dump_json_bytes(obj):
+    """
+    Serializes obj to indented JSON bytes, via orjson when available.
+
+    orjson only supports 2-space indent; the stdlib fallback keeps the
+    original 4-space formatting.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=4).encode('utf-8')
+
+
+# Indent used when assembling records by hand, matching what
+# _dump_json_bytes produces (orjson indents by 2, the stdlib by 4).
+_VALUE_INDENT = b'  ' if orjson is not None else b'    '
+
+
+def _dump_value(v):
+    """Serializes a single scalar JSON value to bytes."""
+    if orjson is not None:
+        return orjson.dumps(v)
+    return json.dumps(v).encode('utf-8')
+
+
+def _key_templates(keys):
+    """
+    Pre-encodes the per-key prefix bytes (indent, quoted key, colon) for
+    a record schema, so encoding a record only serializes its values.
+    """
+    return [_VALUE_INDENT + _dump_value(k) + b': ' for k in keys]
+
+
+def _encode_flat_record(rec, templates, buf):
+    """
+    Assembles one flat record into buf using pre-encoded key prefixes.
+
+    Returns False for records with nested values, which need the generic
+    encoder to come out with matching indentation.
+    """
+    buf.clear()
+    buf += b'{'
+    sep = b'\n'
+    for template, v in zip(templates, rec.values()):
+        if isinstance(v, (dict, list)):
+            return False
+        buf += sep
+        buf += template
+        buf += _dump_value(v)
+        sep = b',\n'
+    buf += b'\n}' if rec else b'}'
+    return True
+
+
+def _write_json_array(out, records):
+    """
+    Writes an iterable of records to out as one JSON array.
+
+    Records are serialized and written one at a time, so the complete
+    serialized document never has to exist in memory and output I/O
+    overlaps with whatever produces the records (e.g. a masking
+    generator over streamed input).  Consecutive records sharing a key
+    schema (the common case for uniform datasets) are assembled into a
+    reused bytearray from pre-encoded key prefixes, so only their values
+    are serialized per record; anything else goes through the generic
+    encoder.
+    """
+    out.write(b'[')
+    first = True
+    schema = templates = None
+    buf = bytearray()
+    for rec in records:
+        out.write(b'\n' if first else b',\n')
+        first = False
+        if isinstance(rec, dict):
+            keys = tuple(rec)
+            if keys != schema:
+                schema, templates = keys, _key_templates(keys)
+            if _encode_flat_record(rec, templates, buf):
+                out.write(buf)
+                continue
+        out.write(_dump_json_bytes(rec))
+    out.write(b'\n]' if not first else b']')
+
+
+# Dispatch table mapping masking types to Faker generator methods.  A single
+# dict lookup replaces the branch chain previously in apply_masking; each
+# entry is called with the Faker instance.
+_MASKERS = {
+    'name': lambda f: f.name(),
+    'email': lambda f: f.email(),
+    'address': lambda f: f.address(),
+    'phone_number': lambda f: f.phone_number(),
+    'company': lambda f: f.company(),
+    'ssn': lambda f: f.ssn(),
+    'date': lambda f: f.date(),
+    'city': lambda f: f.city(),
+    'country': lambda f: f.country(),
+    'text': lambda f: f.text(),
+    'password': lambda f: f.password(),  # Generates a random password
+}
+
+
+def _apply_masking(fake, masking_type):
+    """
+    Generates one masked value of the given type using the Faker instance.
+    """
+    fn = _MASKERS.get(masking_type)
+    if fn is None:
+        logging.warning(f"Unknown masking type: {masking_type}.  Returning 'MASKED'.")
+        return 'MASKED'
+    try:
+        return fn(fake)
+    except Exception as e:
+        logging.error(f"Error applying masking: {e}")
+        return 'MASKED_ERROR'
+
+
+def _vector_match(col, op, literal):
+    """
+    Evaluates `value <op> literal` over a whole column with NumPy.
+
+    Returns the list of matching indices, or None when the column can't
+    be compared in one array operation (mixed/missing values, unsupported
+    literal type), in which case the caller uses the Python predicate.
+    Integer columns compare in int64 so wide identifiers stay exact;
+    comparisons that would push an integer beyond float64's 2**53 exact
+    range fall back rather than silently rounding.  String columns
+    support equality only, since inequality would wrongly match records
+    missing the key.
+    """
+    if np is None:
+        return None
+    try:
+        if isinstance(literal, bool) or not isinstance(literal, (int, float, str)):
+            return None
+        if isinstance(literal, (int, float)):
+            if isinstance(literal, int) and abs(literal) > 2 ** 63 - 1:
+                return None  # outside int64; Python compares arbitrary precision
+            # Infers the dtype: a column of ints stays int64 (exact), a
+            # column with floats or non-numbers becomes float64 or object.
+            arr = np.asarray(col)
+            kind = arr.dtype.kind
+            if kind not in 'if':
+                return None
+            # Once floats are involved on either side, integers beyond
+            # 2**53 would round, so those comparisons stay exact in Python.
+            if (kind == 'f' or isinstance(literal, float)) and abs(literal) >= 2 ** 53:
+                return None
+            if _numba_cmp_mask is not None:
+                mask = _numba_cmp_mask(arr, literal, _NUMBA_OP_IDS[op])
+            else:
+                mask = op(arr, literal)
+        elif op is operator.eq:
+            mask = np.asarray(col, dtype=object) == literal
+        else:
+            return None
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if not isinstance(mask, np.ndarray):
+        return None
+    return np.flatnonzero(mask).tolist()
+
+
+def _prune_rules(rules, data):
+    """
+    Drops rules that cannot apply to the given dataset.
+
+    Builds the key universe from the first few records; a rule whose
+    target field or referenced condition keys appear in none of the
+    sampled records can never fire there, so it is dropped with a single
+    warning instead of being re-checked (or failing) once per record.
+    """
+    universe = set()
+    for rec in data[:_SCHEMA_SAMPLE]:
+        universe.update(rec)
+
+    kept = []
+    for rule in rules:
+        if rule['field'] not in universe:
+            logging.warning(f"Field '{rule['field']}' not found in sampled records. Skipping rule.")
+            continue
+        keys = rule['_keys']
+        if keys and not universe.issuperset(keys):
+            missing = sorted(set(keys) - universe)
+            logging.warning(f"Condition references missing fields {missing}. Skipping rule.")
+            continue
+        kept.append(rule)
+    return kept
+
+
+def _match_rule(rule, masked_data, cols):
+    """
+    Evaluates one rule's condition across the dataset.
+
+    Returns the list of matching record indices, preferring the
+    vectorized comparison, then the specialized closure over the
+    columnar view, then the eval fallback over whole records.
+    """
+    fn = rule['_fn']
+    keys = rule['_keys']
+
+    matched_indices = None
+    cond_errors = 0
+    last_error = None
+    if fn is not None and rule['_vec'] is not None:
+        # Simple `key <op> literal` conditions collapse to one C-level
+        # array comparison over the column.
+        key, op, literal = rule['_vec']
+        matched_indices = _vector_match(cols[key], op, literal)
+
+    if matched_indices is not None:
+        pass
+    elif fn is not None:
+        matched_indices = []
+        if not keys:
+            # Constant condition: evaluate once for the whole dataset.
+            try:
+                if fn():
+                    matched_indices = list(range(len(masked_data)))
+            except Exception as e:
+                cond_errors, last_error = 1, e
+        elif len(keys) == 1:
+            # Bind the bound method once; the loop body then only does
+            # LOAD_FAST instead of a method lookup per record.
+            append = matched_indices.append
+            for i, v in enumerate(cols[keys[0]]):
+                if v is _MISSING:
+                    continue
+                try:
+                    if fn(v):
+                        append(i)
+                except Exception as e:
+                    cond_errors += 1
+                    last_error = e
+        else:
+            append = matched_indices.append
+            for i, vals in enumerate(zip(*(cols[k] for k in keys))):
+                if _MISSING in vals:
+                    continue
+                try:
+                    if fn(*vals):
+                        append(i)
+                except Exception as e:
+                    cond_errors += 1
+                    last_error = e
+    else:
+        matched_indices = []
+        append = matched_indices.append
+        code = rule['_code']
+        for i, rec in enumerate(masked_data):
+            try:
+                if eval(code, _GLOBALS, rec):
+                    append(i)
+            except Exception as e:
+                cond_errors += 1
+                last_error = e
+
+    # One aggregated line per rule replaces formatting and emitting an
+    # error inside the hot loop for every failing record.
+    if cond_errors:
+        logging.error("Condition %r failed to evaluate for %d records (last error: %s)",
+                      rule['condition'], cond_errors, last_error)
+    return matched_indices
+
+
+def _mask_records(rules, data, fake, in_place=False):
+    """
+    Masks a list of records against precompiled rules.
+
+    Applies rules one at a time across the whole dataset: first a flat
+    pass evaluating the condition to collect matching indices, then a
+    flat pass scattering pre-generated masked values back to just those
+    records.  Rules targeting the same field apply first-match-wins per
+    record.  Records are only copied when a mask actually writes to
+    them, so untouched input records cost nothing; with in_place=True
+    even that copy is skipped and the input records are mutated.
+
+    Callers are expected to have pruned the rules against the dataset's
+    schema already (see _prune_rules); pruning is done once per input,
+    not per chunk, so streamed chunks all see the same rule list.
+    """
+    masked_data = data if in_place else list(data)
+
+    # Columnar (structure-of-arrays) view of every field referenced by a
+    # rewritten condition, built in one pass over the records.  Predicates
+    # then scan flat lists instead of doing per-record dict lookups; keys
+    # absent from a record are marked with the _MISSING sentinel, which
+    # subsumes the per-record presence check.
+    referenced = set()
+    for rule in rules:
+        referenced.update(rule['_keys'] or ())
+    cols = {k: [rec.get(k, _MISSING) for rec in masked_data] for k in referenced}
+
+    missing_fields = Counter()
+
+    # Group rules by target field: for each record, the first rule whose
+    # condition matches wins that field, and later rules for the same
+    # field skip records that are already masked.  This avoids generating
+    # Faker values that an overlapping rule would immediately overwrite.
+    rules_by_field = {}
+    for rule in rules:
+        rules_by_field.setdefault(rule['field'], []).append(rule)
+
+    for field_to_mask, field_rules in rules_by_field.items():
+        # Keep the columnar view in sync when a later rule's condition
+        # reads the field being masked.
+        masked_col = cols.get(field_to_mask)
+        unmasked = None  # indices not yet masked for this field; None until needed
+
+        for rule in field_rules:
+            matched_indices = _match_rule(rule, masked_data, cols)
+            if unmasked is not None:
+                matched_indices = [i for i in matched_indices if i in unmasked]
+
+            # Pre-generate the batch of masked values for this rule up
+            # front, so Faker runs in one tight loop instead of being
+            # interleaved with the scatter writes.  The pre-resolved
+            # masker callable skips the per-value table lookup; anything
+            # unexpected falls back to the guarded per-value path.
+            mask_fn = rule['_masker']
+            try:
+                if mask_fn is not None:
+                    fake_batch = [mask_fn(fake) for _ in matched_indices]
+                else:
+                    fake_batch = [_apply_masking(fake, rule['masking_type'])
+                                  for _ in matched_indices]
+            except Exception:
+                fake_batch = [_apply_masking(fake, rule['masking_type'])
+                              for _ in matched_indices]
+
+            for i, fake_value in zip(matched_indices, fake_batch):
+                rec = masked_data[i]
+                if field_to_mask in rec:
+                    # Copy-on-write: the shared record is only duplicated
+                    # the first time a mask actually writes to it.
+                    if not in_place and rec is data[i]:
+                        rec = rec.copy()
+                        masked_data[i] = rec
+                    rec[field_to_mask] = fake_value
+                    if masked_col is not None:
+                        masked_col[i] = fake_value
+                else:
+                    missing_fields[field_to_mask] += 1
+
+            if len(field_rules) > 1:
+                if unmasked is None:
+                    unmasked = set(range(len(masked_data)))
+                unmasked.difference_update(matched_indices)
+                if not unmasked:
+                    break
+
+    for field, count in missing_fields.items():
+        logging.warning("Field %r not found in %d records. Skipped masking.", field, count)
+
+    return masked_data
+
+
+# Per-process state for parallel masking, set up once by _init_worker.
+_WORKER_FAKE = None
+_WORKER_RULES = None
+
+
+def _init_worker(plain_rules):
+    """
+    Initializes per-process state for parallel masking.
+
+    Runs once per worker process, so the Faker construction (provider
+    registry loading) and rule recompilation are amortized across every
+    shard the worker handles.  Compiled code objects and closures don't
+    pickle, which is why workers receive plain rules and recompile them.
+    """
+    global _WORKER_FAKE, _WORKER_RULES
+    _WORKER_FAKE = Faker()
+    _WORKER_RULES = _compile_rules(plain_rules)
+
+
+def _mask_chunk(records):
+    """
+    Worker for parallel masking: masks one shard of records.
+
+    Top level so it is picklable.  Records arriving here are
+    process-local unpickled copies, so they can safely be masked in place.
+    """
+    return _mask_records(_WORKER_RULES, records, _WORKER_FAKE, in_place=True)
+
+
+class _ConditionRewriter(ast.NodeTransformer):
+    """
+    Rewrites record references in a condition expression to plain parameters.
+
+    Both `record['key']` subscripts and bare `key` names are rewritten to
+    `__v_key` so the expression can be compiled into a specialized lambda
+    that takes the referenced values directly, bypassing eval() and the
+    dict-as-locals lookup path entirely.
+
+    A called name that resolves in builtins (e.g. `len(...)`) is left
+    alone so it keeps meaning the builtin; everywhere else bare names are
+    treated as record keys, mirroring how eval resolved names with the
+    record as locals shadowing builtins.
+    """
+
+    def __init__(self):
+        self.keys = []  # referenced record keys, in first-seen order
+
+    def _param(self, key):
+        if key not in self.keys:
+            self.keys.append(key)
+        return ast.Name(id=f'__v_{key}', ctx=ast.Load())
+
+    def visit_Subscript(self, node):
+        if (isinstance(node.value, ast.Name) and node.value.id == 'record'
+                and isinstance(node.slice, ast.Constant)
+                and isinstance(node.slice.value, str)
+                and node.slice.value.isidentifier()):
+            return self._param(node.slice.value)
+        return self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and hasattr(builtins, node.func.id):
+            # Rewrite the arguments but keep the builtin callable itself.
+            node.args = [self.visit(arg) for arg in node.args]
+            for kw in node.keywords:
+                kw.value = self.visit(kw.value)
+            return node
+        return self.generic_visit(node)
+
+    def visit_Name(self, node):
+        if node.id != 'record' and isinstance(node.ctx, ast.Load):
+            return self._param(node.id)
+        return node
+
+
+def _compile_rules(config):
+    """
+    Annotates each rule with its precompiled condition.
+
+    Stores the cached code object under '_code' and, where the rewriter
+    succeeds, a specialized closure and its referenced keys under '_fn'
+    and '_keys'.  Raises ValueError for conditions that do not parse.
+    """
+    for i, rule in enumerate(config):
+        try:
+            rule['_code'] = compile(rule['condition'], f'<rule:{i}>', 'eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid condition in rule {i}: {e}")
+        rule['_fn'], rule['_keys'], rule['_vec'] = _compile_condition(rule['condition'], i)
+        # Resolve the masker callable once here so the batch generator
+        # doesn't repeat the dispatch-table lookup per masked value.
+        rule['_masker'] = _MASKERS.get(rule['masking_type'])
+    return config
+
+
+def _rewritable(tree):
+    """
+    Whether a parsed condition can safely go through the rewriter.
+
+    Expressions that introduce their own scopes (lambdas, comprehensions,
+    walrus bindings) or that load a builtin name outside call position
+    would have those names misread as record keys, so they are left to
+    the eval fallback, which resolves names against the record as locals
+    shadowing builtins exactly as the original evaluation did.
+    """
+    called = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            called.add(node.func)
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Lambda, ast.ListComp, ast.SetComp,
+                             ast.DictComp, ast.GeneratorExp, ast.NamedExpr)):
+            return False
+        if (isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)
+                and node.id != 'record' and node not in called
+                and hasattr(builtins, node.id)):
+            return False
+    return True
+
+
+def _compile_condition(condition, index):
+    """
+    Compiles a condition string into a specialized closure.
+
+    Returns a (function, keys, vec) triple where the function takes the
+    values of the referenced record keys as positional arguments.  For
+    single-comparison conditions of the shape `key <op> literal`, vec is a
+    (key, operator, literal) triple that can be evaluated as one NumPy
+    array comparison; it is None otherwise.  Returns (None, None, None)
+    for conditions the rewriter cannot handle, in which case the caller
+    should fall back to evaluating the precompiled code object.
+    """
+    try:
+        tree = ast.parse(condition, mode='eval')
+        if not _rewritable(tree):
+            return None, None, None
+        rewriter = _ConditionRewriter()
+        body = rewriter.visit(tree.body)
+
+        vec = None
+        if (isinstance(body, ast.Compare) and len(body.ops) == 1
+                and isinstance(body.left, ast.Name) and body.left.id.startswith('__v_')
+                and isinstance(body.comparators[0], ast.Constant)):
+            op = _VEC_OPS.get(type(body.ops[0]))
+            if op is not None:
+                vec = (body.left.id[len('__v_'):], op, body.comparators[0].value)
+
+        args = ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(arg=f'__v_{k}') for k in rewriter.keys],
+            kwonlyargs=[], kw_defaults=[], defaults=[])
+        lam = ast.Expression(body=ast.Lambda(args=args, body=body))
+        ast.fix_missing_locations(lam)
+        fn = eval(compile(lam, f'<rule:{index}>', 'eval'), _GLOBALS)
+        return fn, tuple(rewriter.keys), vec
+    except (SyntaxError, ValueError):
+        return None, None, None
+
 class ConditionalMasker:
     """
     Masks data based on conditions specified in a configuration file.
     """
 
-    def __init__(self, config_file, input_file, output_file):
+    def __init__(self, config_file, input_file, output_file, in_place=False):
         """
         Initializes the ConditionalMasker.
 
@@ -20,12 +667,23 @@ class ConditionalMasker:
             config_file (str): Path to the configuration file.
             input_file (str): Path to the input data file.
             output_file (str): Path to the output masked data file.
+            in_place (bool): Mutate input records directly instead of
+                copying them, for callers that don't need the originals.
         """
         self.config_file = config_file
         self.input_file = input_file
         self.output_file = output_file
+        self.in_place = in_place
         self.config = self.load_config()
         self.fake = Faker()
+        # JIT-compile the numeric comparison kernel up front when a rule
+        # will actually dispatch to it.
+        if self.config and any(
+                rule['_vec'] is not None
+                and isinstance(rule['_vec'][2], (int, float))
+                and not isinstance(rule['_vec'][2], bool)
+                for rule in self.config):
+            _warm_numba()
 
     def load_config(self):
         """
@@ -44,7 +702,9 @@ class ConditionalMasker:
                 if not isinstance(rule, dict) or 'condition' not in rule or 'field' not in rule or 'masking_type' not in rule:
                     raise ValueError("Each rule must be a dictionary with 'condition', 'field', and 'masking_type' keys.")
 
-            return config
+            # Precompile each condition once so mask_data doesn't re-parse
+            # the strings for every record.
+            return _compile_rules(config)
         except FileNotFoundError:
             logging.error(f"Configuration file not found: {self.config_file}")
             return None  # Return None to indicate failure
@@ -69,32 +729,41 @@ class ConditionalMasker:
             list: The masked data.
         """
 
-        masked_data = []
-        for record in data:
-            masked_record = record.copy()  # Create a copy to avoid modifying the original
-            for rule in self.config:
-                try:
-                    if eval(rule['condition'], {}, masked_record): # Evaluate condition using record data
-                        field_to_mask = rule['field']
-                        masking_type = rule['masking_type']
+        return _mask_records(_prune_rules(self.config, data), data, self.fake, self.in_place)
 
-                        if field_to_mask in masked_record:
-                            masked_record[field_to_mask] = self.apply_masking(masking_type)
-                        else:
-                            logging.warning(f"Field '{field_to_mask}' not found in record. Skipping masking.")
+    def _mask_maybe_parallel(self, data):
+        """
+        Masks data, fanning out to worker processes for large inputs.
 
+        Records are independent, so the dataset is sharded across the
+        available cores; small inputs stay serial because process startup
+        would cost more than it saves.
+        """
+        workers = os.cpu_count() or 1
+        if workers == 1 or len(data) < _PARALLEL_MIN_RECORDS:
+            return self.mask_data(data)
 
-                except NameError as e:
-                    logging.error(f"Error in condition evaluation.  Invalid variable used: {e}")
-                    continue # Skip to the next rule
-                except Exception as e:
-                    logging.error(f"Error evaluating condition or masking: {e}")
-                    continue
+        # Prune once against the whole dataset so every shard works from
+        # the same rule list.  Only the plain rule fields are picklable;
+        # workers recompile them.
+        pruned = _prune_rules(self.config, data)
+        plain_rules = [{k: v for k, v in rule.items() if not k.startswith('_')}
+                       for rule in pruned]
+        shard_size = -(-len(data) // workers)  # ceil division
+        shards = [data[i:i + shard_size] for i in range(0, len(data), shard_size)]
 
-            masked_data.append(masked_record)
+        # Preallocate the result and fill by slice assignment; shard sizes
+        # are known, so the list never has to grow and reallocate.
+        masked_data = [None] * len(data)
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(plain_rules,)) as ex:
+            pos = 0
+            for part in ex.map(_mask_chunk, shards):
+                masked_data[pos:pos + len(part)] = part
+                pos += len(part)
         return masked_data
 
-
     def apply_masking(self, masking_type):
         """
         Applies the specified masking technique.
@@ -105,70 +774,136 @@ class ConditionalMasker:
         Returns:
             str: The masked value.
         """
-        try:
-            if masking_type == 'name':
-                return self.fake.name()
-            elif masking_type == 'email':
-                return self.fake.email()
-            elif masking_type == 'address':
-                return self.fake.address()
-            elif masking_type == 'phone_number':
-                return self.fake.phone_number()
-            elif masking_type == 'company':
-                return self.fake.company()
-            elif masking_type == 'ssn':
-                return self.fake.ssn()
-            elif masking_type == 'date':
-                return self.fake.date()
-            elif masking_type == 'city':
-                return self.fake.city()
-            elif masking_type == 'country':
-                return self.fake.country()
-            elif masking_type == 'text':
-                return self.fake.text()
-            elif masking_type == 'password':
-                return self.fake.password() # Generates a random password
-            else:
-                logging.warning(f"Unknown masking type: {masking_type}.  Returning 'MASKED'.")
-                return 'MASKED'
-        except Exception as e:
-            logging.error(f"Error applying masking: {e}")
-            return 'MASKED_ERROR'
+        return _apply_masking(self.fake, masking_type)
 
 
 
     def process_data(self):
         """
         Reads data from the input file, masks it, and writes it to the output file.
+
+        Streams the input record by record when ijson is available, so peak
+        memory stays bounded by the chunk size instead of the file size.
+        Falls back to loading the whole file otherwise.
         """
         if self.config is None:
             logging.error("Configuration loading failed.  Exiting.")
             return
 
         try:
-            with open(self.input_file, 'r') as f:
-                try:
-                    data = json.load(f)
-                except json.JSONDecodeError:
-                    logging.error(f"Invalid JSON in input file: {self.input_file}")
-                    return
+            if ijson is not None:
+                self._process_streaming()
+            else:
+                self._process_buffered()
+        except FileNotFoundError:
+            logging.error(f"Input file not found: {self.input_file}")
+        except Exception as e:
+            logging.exception(f"Error processing data: {e}")  # Log exception with traceback
 
-            if not isinstance(data, list):
-                logging.error("Input file must contain a list of records (JSON array).")
+    def _process_buffered(self):
+        """
+        Loads the entire input into memory, masks it, and writes the output.
+        """
+        # Read raw bytes with a large buffer and hand them straight to the
+        # parser, skipping the TextIO decoding layer entirely.  Large files
+        # are memory-mapped so the parser works out of kernel-paged memory
+        # instead of a full file-sized bytes copy; stdlib json can't parse
+        # from a buffer view, so the mmap path needs orjson.
+        with open(self.input_file, 'rb', buffering=_READ_BUFFER_SIZE) as f:
+            try:
+                if (orjson is not None
+                        and os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES):
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        # Release the view before the mmap closes even when
+                        # the parser raises; a traceback holding it alive
+                        # would turn the close into a BufferError.
+                        view = memoryview(mm)
+                        try:
+                            data = _load_json(view)
+                        finally:
+                            view.release()
+                else:
+                    data = _load_json(f.read())
+            except json.JSONDecodeError:
+                logging.error(f"Invalid JSON in input file: {self.input_file}")
                 return
 
-            masked_data = self.mask_data(data)
+        if not isinstance(data, list):
+            logging.error("Input file must contain a list of records (JSON array).")
+            return
 
-            with open(self.output_file, 'w') as f:
-                json.dump(masked_data, f, indent=4)
+        masked_data = self._mask_maybe_parallel(data)
 
-            logging.info(f"Data masking complete.  Output written to: {self.output_file}")
+        with open(self.output_file, 'wb') as f:
+            _write_json_array(f, masked_data)
 
+        logging.info(f"Data masking complete.  Output written to: {self.output_file}")
 
-        except FileNotFoundError:
-            logging.error(f"Input file not found: {self.input_file}")
-        except Exception as e:
-            logging.exception(f"Error processing data: {e}")  # Log exception with traceback
+    def _process_streaming(self):
+        """
+        Streams records through the masker in fixed-size chunks.
+
+        Parses the input incrementally with ijson and writes each masked
+        chunk to the output as it is produced, so only one chunk of records
+        is ever held in memory.
+        """
+        with open(self.input_file, 'rb', buffering=_READ_BUFFER_SIZE) as f:
+            # ijson silently yields nothing for a non-array top level, so
+            # check the leading byte up front to keep the original error.
+            head = f.read(1)
+            while head.isspace():
+                head = f.read(1)
+            if head != b'[':
+                logging.error("Input file must contain a list of records (JSON array).")
+                return
+            f.seek(0)
+
+            # Stream into a temporary file and rename on success, so a
+            # parse error surfacing mid-stream never leaves a partially
+            # written output behind (the buffered path writes nothing on
+            # invalid input, and this path shouldn't either).
+            tmp_path = self.output_file + '.tmp'
+            try:
+                with open(tmp_path, 'wb') as out:
+                    try:
+                        _write_json_array(out, self._iter_masked(f))
+                    except ijson.JSONError:
+                        logging.error(f"Invalid JSON in input file: {self.input_file}")
+                        return
+                os.replace(tmp_path, self.output_file)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        logging.info(f"Data masking complete.  Output written to: {self.output_file}")
+
+    def _iter_masked(self, f):
+        """
+        Yields masked records from an open input file, one chunk at a time.
+
+        Rules are pruned once against the first chunk and the pruned list
+        is reused for the rest of the stream, so which rules apply never
+        depends on chunk boundaries.
+        """
+        # The chunk buffer is preallocated at its fixed size and filled by
+        # index, instead of being append-grown and reallocated per chunk.
+        chunk = [None] * _CHUNK_SIZE
+        filled = 0
+        pruned = None
+        for record in ijson.items(f, 'item', use_float=True):
+            chunk[filled] = record
+            filled += 1
+            if filled == _CHUNK_SIZE:
+                if pruned is None:
+                    pruned = _prune_rules(self.config, chunk)
+                yield from _mask_records(pruned, chunk, self.fake, self.in_place)
+                chunk = [None] * _CHUNK_SIZE
+                filled = 0
+        if filled:
+            del chunk[filled:]
+            if pruned is None:
+                pruned = _prune_rules(self.config, chunk)
+            yield from _mask_records(pruned, chunk, self.fake, self.in_place)
 
 
 